@@ -0,0 +1,28 @@
+from copy import copy, deepcopy
+
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+
+
+class CachedFieldsSerializerMixin:
+    """
+    Build the field map once per serializer class and hand out copies of it,
+    instead of re-introspecting the model on every instantiation.
+    """
+    _fields_cache = {}
+
+    # Fields holding a child field/serializer are deep-copied so that bound
+    # state (parent, context) is never shared between serializer instances.
+    _nested_field_types = (serializers.BaseSerializer, serializers.ListField,
+                           serializers.DictField, ManyRelatedField)
+
+    def get_fields(self):
+        cls = type(self)
+        fields = CachedFieldsSerializerMixin._fields_cache.get(cls)
+        if fields is None:
+            fields = super().get_fields()
+            CachedFieldsSerializerMixin._fields_cache[cls] = fields
+        return {
+            name: deepcopy(field) if isinstance(field, self._nested_field_types) else copy(field)
+            for name, field in fields.items()
+        }
@@ -30,22 +30,28 @@ class StoryTemplateAdminForm(forms.ModelForm):
                 stories=self.instance
             )
 
-    def save(self, commit=True):
-        template = super().save(commit=commit)
-        if commit:
-            # Get selected collections
-            collections = self.cleaned_data.get('collections', [])
-
-            # Remove template from collections that weren't selected
-            for collection in StoryCollection.objects.filter(stories=template):
-                if collection not in collections:
-                    collection.stories.remove(template)
-
-            # Add template to selected collections
-            for collection in collections:
-                collection.stories.add(template)
-
-        return template
+    def _save_m2m(self):
+        super()._save_m2m()
+        # The admin saves with commit=False and calls save_m2m() afterwards,
+        # so the collections are synced here rather than in save()
+        template = self.instance
+        collections = self.cleaned_data.get('collections', [])
+        collection_ids = [collection.id for collection in collections]
+        through = StoryCollection.stories.through
+
+        # Remove template from collections that weren't selected
+        through.objects.filter(storytemplate=template).exclude(
+            storycollection_id__in=collection_ids
+        ).delete()
+
+        # Add template to selected collections
+        through.objects.bulk_create(
+            [
+                through(storycollection_id=collection_id, storytemplate_id=template.pk)
+                for collection_id in collection_ids
+            ],
+            ignore_conflicts=True
+        )
 
 
 @admin.register(StoryTemplate)
@@ -57,10 +63,13 @@ class StoryTemplateAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description']
 
     def get_collections(self, obj):
-        return ", ".join([c.title for c in StoryCollection.objects.filter(stories=obj)])
+        return ", ".join([c.title for c in obj.storycollection_set.all()])
 
     get_collections.short_description = 'Collections'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('storycollection_set')
+
 
 class StoryPartInline(admin.TabularInline):
     model = StoryPart
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-17 13:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stories', '0004_imageasset'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(fields=['author', '-created_date'], name='stories_sto_author__38ee75_idx'),
+        ),
+    ]
@@ -42,6 +42,9 @@ class Story(models.Model):
 
     class Meta:
         ordering = ['-created_date']
+        indexes = [
+            models.Index(fields=['author', '-created_date']),
+        ]
 
 
 class StoryPartTemplate(models.Model):
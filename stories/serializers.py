@@ -1,74 +1,82 @@
 from rest_framework import serializers
+
+from derakht.serializers import CachedFieldsSerializerMixin
 from .models import Story, StoryTemplate, StoryPart, StoryPartTemplate, StoryCollection, ImageAsset
 
 
-class ImageAssetSerializer(serializers.ModelSerializer):
+class FileURLField(serializers.ImageField):
+    """
+    Read-only field rendering a file's URL. URLs are resolved once per file
+    for the lifetime of the serializer context, rather than asking the storage
+    backend again for every row.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        urls = self.context.setdefault('file_urls', {})
+        url = urls.get(value.name)
+        if url is None:
+            url = urls[value.name] = value.url
+        return url
+
+
+class ImageAssetSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ImageAsset
         fields = ['id', 'file', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class StoryPartSerializer(serializers.ModelSerializer):
+class StoryPartSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     illustration_id = serializers.UUIDField(write_only=True, required=False, allow_null=True)
-    illustration = serializers.SerializerMethodField()
+    illustration = FileURLField()
 
     class Meta:
         model = StoryPart
         fields = ['id', 'position', 'text', 'illustration', 'illustration_id', 'created_date', 'story_part_template']
         read_only_fields = ['position', 'illustration']
 
-    def get_illustration(self, obj):
-        if obj.illustration:
-            return obj.illustration.url
-        return None
+    def validate_illustration_id(self, value):
+        """Resolve the id to the user's ImageAsset, failing validation if there is none"""
+        if value is None:
+            return value
+        try:
+            return ImageAsset.objects.get(id=value, uploaded_by=self.context['request'].user)
+        except ImageAsset.DoesNotExist:
+            raise serializers.ValidationError("Invalid image ID")
 
     def create(self, validated_data):
-        illustration_id = validated_data.pop('illustration_id', None)
-        if illustration_id:
-            try:
-                image_asset = ImageAsset.objects.get(
-                    id=illustration_id,
-                    uploaded_by=self.context['request'].user
-                )
-                validated_data['illustration'] = image_asset.file
-            except ImageAsset.DoesNotExist:
-                raise serializers.ValidationError({"illustration_id": "Invalid image ID"})
+        image_asset = validated_data.pop('illustration_id', None)
+        if image_asset:
+            validated_data['illustration'] = image_asset.file
 
         return super().create(validated_data)
 
     def update(self, instance, validated_data):
-        illustration_id = validated_data.pop('illustration_id', None)
-        if illustration_id:
-            try:
-                image_asset = ImageAsset.objects.get(
-                    id=illustration_id,
-                    uploaded_by=self.context['request'].user
-                )
-                validated_data['illustration'] = image_asset.file
-            except ImageAsset.DoesNotExist:
-                raise serializers.ValidationError({"illustration_id": "Invalid image ID"})
-        elif illustration_id is None and 'illustration_id' in self.initial_data:
+        image_asset = validated_data.pop('illustration_id', None)
+        if image_asset:
+            validated_data['illustration'] = image_asset.file
+        elif image_asset is None and 'illustration_id' in self.initial_data:
             # If illustration_id is explicitly set to null, remove the illustration
             validated_data['illustration'] = None
 
         return super().update(instance, validated_data)
 
 
-class StoryPartTemplateSerializer(serializers.ModelSerializer):
-    illustration = serializers.SerializerMethodField()
+class StoryPartTemplateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    illustration = FileURLField()
 
     class Meta:
         model = StoryPartTemplate
         fields = ['id', 'position', 'prompt_text', 'illustration']
 
-    def get_illustration(self, obj):
-        if obj.illustration:
-            return obj.illustration.url
-        return None
-
 
-class StoryTemplateSerializer(serializers.ModelSerializer):
+class StoryTemplateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     template_parts = StoryPartTemplateSerializer(many=True, read_only=True)
 
     class Meta:
@@ -76,19 +84,29 @@ class StoryTemplateSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'activity_type', 'template_parts']
 
 
-class StorySerializer(serializers.ModelSerializer):
-    parts = StoryPartSerializer(many=True, read_only=True)
+class StorySummarySerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     author = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
         model = Story
-        fields = ['id', 'title', 'author', 'created_date', 'activity_type', 'story_template', 'parts']
+        fields = ['id', 'title', 'author', 'created_date', 'activity_type', 'story_template']
         read_only_fields = ['author', 'activity_type', 'story_template']
 
 
-class StoryCollectionSerializer(serializers.ModelSerializer):
+class StorySerializer(StorySummarySerializer):
+    parts = StoryPartSerializer(many=True, read_only=True)
+
+    class Meta(StorySummarySerializer.Meta):
+        fields = StorySummarySerializer.Meta.fields + ['parts']
+
+
+class StoryCollectionSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     stories = StoryTemplateSerializer(many=True, read_only=True)
 
     class Meta:
         model = StoryCollection
-        fields = ['id', 'title', 'description', 'stories', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'title', 'description', 'stories', 'created_at', 'updated_at']
+
+
+class StoryIdsSerializer(serializers.Serializer):
+    story_ids = serializers.ListField(child=serializers.UUIDField(), default=list)
@@ -1,3 +1,316 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from .models import (
+    ActivityType, ImageAsset, Story, StoryCollection, StoryPart, StoryPartTemplate, StoryTemplate
+)
+
+User = get_user_model()
+
+
+def create_user(email='writer@example.com', **kwargs):
+    return User.objects.create_user(
+        email=email,
+        username=email,
+        password='Secret-pass-123',
+        first_name='Test',
+        last_name='User',
+        age=10,
+        **kwargs
+    )
+
+
+class StoryTemplateAdminTests(TestCase):
+    def setUp(self):
+        self.admin = create_user('admin@example.com', is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+        self.template = StoryTemplate.objects.create(
+            title='Forest', description='A walk', activity_type=ActivityType.WRITE_FOR_DRAWING
+        )
+        self.kept = StoryCollection.objects.create(title='Kept', description='')
+        self.dropped = StoryCollection.objects.create(title='Dropped', description='')
+        self.added = StoryCollection.objects.create(title='Added', description='')
+        self.kept.stories.add(self.template)
+        self.dropped.stories.add(self.template)
+
+    def test_change_form_syncs_collections(self):
+        response = self.client.post(
+            reverse('admin:stories_storytemplate_change', args=[self.template.pk]),
+            {
+                'title': 'Forest',
+                'description': 'A walk',
+                'activity_type': ActivityType.WRITE_FOR_DRAWING,
+                'collections': [self.kept.pk, self.added.pk],
+                'template_parts-TOTAL_FORMS': '0',
+                'template_parts-INITIAL_FORMS': '0',
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertQuerySetEqual(
+            self.template.storycollection_set.order_by('title'),
+            [self.added, self.kept],
+        )
+
+
+class StoryAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.template = StoryTemplate.objects.create(
+            title='Forest', description='A walk', activity_type=ActivityType.ILLUSTRATE
+        )
+        self.part_templates = [
+            StoryPartTemplate.objects.create(
+                template=self.template, position=position, prompt_text=f'Prompt {position}'
+            )
+            for position in (1, 2)
+        ]
+        self.story = Story.objects.create(
+            title='Draft', author=self.user, activity_type=ActivityType.ILLUSTRATE,
+            story_template=self.template
+        )
+
+    def fill_parts(self, story=None):
+        for part_template in self.part_templates:
+            StoryPart.objects.create(
+                story=story or self.story, position=part_template.position, text='Text',
+                story_part_template=part_template
+            )
+
+
+class AddPartTests(StoryAPITestCase):
+    def add_part(self, **data):
+        data.setdefault('story_part_template_id', self.part_templates[0].id)
+        return self.client.post(
+            reverse('story-add-part', args=[self.story.pk]), data, format='json'
+        )
+
+    def test_add_part_with_own_image(self):
+        asset = ImageAsset.objects.create(file='image_assets/own.png', uploaded_by=self.user)
+
+        response = self.add_part(text='Once upon a time', illustration_id=str(asset.id))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['position'], 1)
+        self.assertTrue(response.data['illustration'].endswith('image_assets/own.png'))
+        self.assertEqual(self.story.parts.get().illustration.name, 'image_assets/own.png')
+
+    def test_add_part_rejects_another_users_image(self):
+        other = create_user('other@example.com')
+        asset = ImageAsset.objects.create(file='image_assets/other.png', uploaded_by=other)
+
+        response = self.add_part(text='Once', illustration_id=str(asset.id))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'illustration_id': ['Invalid image ID']})
+        self.assertFalse(self.story.parts.exists())
+
+    def test_add_part_rejects_filled_position(self):
+        self.assertEqual(self.add_part(text='First').status_code, status.HTTP_201_CREATED)
+
+        response = self.add_part(text='Again')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'error': 'A part at this position already exists'})
+
+
+class StoryTemplateCacheTests(StoryAPITestCase):
+    def test_retrieve_is_served_from_cache(self):
+        url = reverse('storytemplate-detail', args=[self.template.pk])
+        first = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(len(second.data['template_parts']), 2)
+
+
+class StartStoryTests(StoryAPITestCase):
+    def start_story(self):
+        return self.client.post(reverse('storytemplate-start-story', args=[self.template.pk]))
+
+    def test_start_story_copies_template(self):
+        response = self.start_story()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        story = Story.objects.get(pk=response.data['story']['id'])
+        self.assertEqual(story.title, 'Draft: Forest')
+        self.assertEqual(story.activity_type, ActivityType.ILLUSTRATE)
+        self.assertEqual(story.story_template, self.template)
+        self.assertEqual(response.data['story']['parts'], [])
+        self.assertEqual([part['position'] for part in response.data['template_parts']], [1, 2])
+
+    def test_start_story_uses_current_template_over_cached_data(self):
+        self.client.get(reverse('storytemplate-detail', args=[self.template.pk]))
+        StoryTemplate.objects.filter(pk=self.template.pk).update(title='Renamed')
+
+        # Cached template parts: one query for the template, one insert
+        with self.assertNumQueries(2):
+            response = self.start_story()
+
+        self.assertEqual(response.data['story']['title'], 'Draft: Renamed')
+
+    def test_start_story_from_deleted_cached_template(self):
+        self.client.get(reverse('storytemplate-detail', args=[self.template.pk]))
+        self.story.delete()
+        StoryTemplate.objects.filter(pk=self.template.pk).delete()
+
+        response = self.start_story()
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class StoryListTests(StoryAPITestCase):
+    def test_list_returns_summaries_without_parts(self):
+        self.fill_parts()
+        other_story = Story.objects.create(title='Second', author=self.user)
+        self.fill_parts(other_story)
+
+        # One query to count, one for the page; parts are never loaded
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('story-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            set(response.data['results'][0]),
+            {'id', 'title', 'author', 'created_date', 'activity_type', 'story_template'},
+        )
+
+
+class StoryRetrieveTests(StoryAPITestCase):
+    def test_retrieve_prefetches_parts(self):
+        self.fill_parts()
+
+        # One query for the story, one for all of its parts
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('story-detail', args=[self.story.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([part['position'] for part in response.data['parts']], [1, 2])
+
+    def test_retrieve_hides_other_authors_stories(self):
+        other = create_user('other@example.com')
+        story = Story.objects.create(title='Theirs', author=other)
+
+        response = self.client.get(reverse('story-detail', args=[story.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class StoryUpdateTests(StoryAPITestCase):
+    def test_partial_update_returns_summary(self):
+        self.fill_parts()
+
+        response = self.client.patch(
+            reverse('story-detail', args=[self.story.pk]), {'title': 'Renamed'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Renamed')
+        self.assertNotIn('parts', response.data)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.title, 'Renamed')
+
+    def test_update_cannot_change_read_only_fields(self):
+        response = self.client.patch(
+            reverse('story-detail', args=[self.story.pk]),
+            {'activity_type': ActivityType.COMPLETE_STORY, 'story_template': None},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.activity_type, ActivityType.ILLUSTRATE)
+        self.assertEqual(self.story.story_template, self.template)
+
+
+class FinishStoryTests(StoryAPITestCase):
+    def finish(self, query=''):
+        return self.client.post(
+            reverse('story-finish', args=[self.story.pk]) + query, {'title': 'Done'}, format='json'
+        )
+
+    def test_finish_reports_missing_positions(self):
+        response = self.finish()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['missing_positions'], [1, 2])
+
+    def test_finish_returns_summary_by_default(self):
+        self.fill_parts()
+
+        for query in ('', '?full=0', '?full=false'):
+            with self.subTest(query=query):
+                response = self.finish(query)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data['title'], 'Done')
+                self.assertNotIn('parts', response.data)
+
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.title, 'Done')
+
+    def test_finish_returns_parts_when_requested(self):
+        self.fill_parts()
+
+        response = self.finish('?full=1')
+
+        self.assertEqual([part['position'] for part in response.data['parts']], [1, 2])
+
+
+class CollectionStoriesTests(StoryAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.collection = StoryCollection.objects.create(title='Picks', description='')
+
+    def post(self, action, story_ids):
+        return self.client.post(
+            reverse(f'storycollection-{action}', args=[self.collection.pk]),
+            {'story_ids': story_ids},
+            format='json'
+        )
+
+    def test_add_and_remove_stories(self):
+        response = self.post('add-story', [str(self.template.pk)])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([story['id'] for story in response.data['stories']], [str(self.template.pk)])
+
+        response = self.post('remove-story', [str(self.template.pk)])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['stories'], [])
+
+    def test_malformed_story_ids_are_rejected(self):
+        for story_ids in ('not-a-list', ['not-a-uuid']):
+            with self.subTest(story_ids=story_ids):
+                response = self.post('add-story', story_ids)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('story_ids', response.data)
+
+
+class CollectionUnknownStoryTests(APITransactionTestCase):
+    # The through-table foreign key is only checked on commit, so this needs
+    # real transactions rather than TestCase's rollback
+    def test_add_unknown_story_id(self):
+        self.client.force_authenticate(create_user())
+        collection = StoryCollection.objects.create(title='Picks', description='')
+
+        response = self.client.post(
+            reverse('storycollection-add-story', args=[collection.pk]),
+            {'story_ids': [str(uuid.uuid4())]},
+            format='json'
+        )
 
-# Create your tests here.
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'error': 'Invalid story IDs'})
+        self.assertFalse(collection.stories.exists())
@@ -1,3 +1,7 @@
+from django.core.cache import cache
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import IntegrityError
+from django.db.models import Exists, OuterRef, Prefetch
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets, status
@@ -7,10 +11,14 @@ from .models import Story, StoryTemplate, StoryCollection, StoryPart, StoryPartT
 from .serializers import (
     StorySerializer, StoryTemplateSerializer,
     StoryPartSerializer, StoryCollectionSerializer,
-    StoryPartTemplateSerializer, ImageAssetSerializer
+    ImageAssetSerializer, StorySummarySerializer, StoryIdsSerializer
 )
 from rest_framework.parsers import MultiPartParser, FormParser
 
+# Templates are authored by staff and change rarely. No shared cache backend
+# is configured, so each worker keeps its own copy and edits show up once
+# the entries expire.
+STORY_TEMPLATE_CACHE_TIMEOUT = 60
 
 
 class StoryTemplateViewSet(viewsets.ReadOnlyModelViewSet):
@@ -19,15 +27,42 @@ class StoryTemplateViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         queryset = StoryTemplate.objects.all()
+        # Only list and retrieve render the nested parts
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.prefetch_related('template_parts')
         activity_type = self.request.query_params.get('activity_type', None)
         if activity_type:
             queryset = queryset.filter(activity_type=activity_type)
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        cache_key = f'story_templates:list:{request.build_absolute_uri()}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, STORY_TEMPLATE_CACHE_TIMEOUT)
+        return Response(data)
+
+    def get_template_data(self, template=None):
+        """Serialized template with its parts, shared by retrieve and start_story"""
+        activity_type = self.request.query_params.get('activity_type', '')
+        cache_key = f"story_templates:detail:{self.kwargs['pk']}:{activity_type}"
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_serializer(template or self.get_object()).data
+            cache.set(cache_key, data, STORY_TEMPLATE_CACHE_TIMEOUT)
+        return data
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_template_data())
+
     @action(detail=True, methods=['post'])
     def start_story(self, request, pk=None):
         """Initialize a new story from this template"""
+        # The story is built from the template row itself, so a template
+        # edited or deleted since another worker cached it is never copied
         template = self.get_object()
+        template_parts = self.get_template_data(template)['template_parts']
 
         # Create a new story without parts
         story = Story.objects.create(
@@ -36,14 +71,13 @@ class StoryTemplateViewSet(viewsets.ReadOnlyModelViewSet):
             activity_type=template.activity_type,
             story_template=template
         )
+        # A new story has no parts yet, spare the serializer a query for them
+        story._prefetched_objects_cache = {'parts': StoryPart.objects.none()}
 
         # Return both story and template details
         return Response({
             'story': StorySerializer(story).data,
-            'template_parts': StoryPartTemplateSerializer(
-                template.template_parts.all().order_by('position'),
-                many=True
-            ).data
+            'template_parts': template_parts
         }, status=status.HTTP_201_CREATED)
 
 
@@ -51,7 +85,19 @@ class StoryViewSet(viewsets.ModelViewSet):
     serializer_class = StorySerializer
 
     def get_queryset(self):
-        return Story.objects.filter(author=self.request.user)
+        queryset = Story.objects.filter(author=self.request.user)
+        # Only retrieve renders the nested parts
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch('parts', queryset=StoryPart.objects.order_by('position'))
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        # Lists and writes don't need the nested parts
+        if self.action in ('list', 'create', 'update', 'partial_update'):
+            return StorySummarySerializer
+        return StorySerializer
 
     @action(detail=True, methods=['post'])
     @method_decorator(csrf_exempt)
@@ -60,23 +106,24 @@ class StoryViewSet(viewsets.ModelViewSet):
         story = self.get_object()
         story_part_template_id = request.data.get('story_part_template_id')
 
-        try:
-            # Get the template part
-            story_part_template = StoryPartTemplate.objects.get(
-                id=story_part_template_id,
-                template=story.story_template
+        # Get the template part, noting whether its position is already filled
+        story_part_template = StoryPartTemplate.objects.filter(
+            id=story_part_template_id,
+            template_id=story.story_template_id
+        ).only('id', 'position').annotate(
+            part_exists=Exists(
+                StoryPart.objects.filter(story=story, position=OuterRef('position'))
             )
-        except StoryPartTemplate.DoesNotExist:
+        ).first()
+
+        if story_part_template is None:
             return Response(
                 {'error': 'Invalid story part template ID'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
         # Check if this position already has a part
-        if StoryPart.objects.filter(
-                story=story,
-                position=story_part_template.position
-        ).exists():
+        if story_part_template.part_exists:
             return Response(
                 {'error': 'A part at this position already exists'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -111,64 +158,64 @@ class StoryViewSet(viewsets.ModelViewSet):
         story = self.get_object()
 
         # Verify all template parts have corresponding story parts
-        template_parts_count = story.story_template.template_parts.count()
-        story_parts_count = story.parts.count()
-
-        if story_parts_count < template_parts_count:
-            missing_positions = set(
-                story.story_template.template_parts.values_list('position', flat=True)
-            ) - set(
-                story.parts.values_list('position', flat=True)
-            )
+        missing_positions = list(
+            StoryPartTemplate.objects.filter(
+                template_id=story.story_template_id
+            ).exclude(
+                position__in=story.parts.values('position')
+            ).values_list('position', flat=True)
+        )
+
+        if missing_positions:
             return Response({
                 'error': 'All story parts must be completed before finishing',
-                'missing_positions': list(missing_positions)
+                'missing_positions': missing_positions
             }, status=status.HTTP_400_BAD_REQUEST)
 
         # Update the title if provided
         title = request.data.get('title')
         if title:
+            Story.objects.filter(pk=story.pk).update(title=title)
             story.title = title
-            story.save()
 
-        return Response(StorySerializer(story).data)
+        # Only the title changes here; the full tree is sent on request (?full=1)
+        if request.query_params.get('full', '').lower() in ('1', 'true', 'yes'):
+            return Response(StorySerializer(story).data)
+        return Response(StorySummarySerializer(story).data)
 
 
 class StoryCollectionViewSet(viewsets.ModelViewSet):
     queryset = StoryCollection.objects.all()
     serializer_class = StoryCollectionSerializer
 
+    def get_story_ids(self):
+        serializer = StoryIdsSerializer(data=self.request.data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data['story_ids']
+
     @action(detail=True, methods=['post'])
     def add_story(self, request, pk=None):
         collection = self.get_object()
-        story_ids = request.data.get('story_ids', [])
+        story_ids = self.get_story_ids()
 
         try:
-            stories = StoryTemplate.objects.filter(id__in=story_ids)
-            collection.stories.add(*stories)
-            serializer = self.get_serializer(collection)
-            return Response(serializer.data)
-        except Exception as e:
+            collection.stories.add(*story_ids)
+        except IntegrityError:
             return Response(
-                {'error': str(e)},
+                {'error': 'Invalid story IDs'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        serializer = self.get_serializer(collection)
+        return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def remove_story(self, request, pk=None):
         collection = self.get_object()
-        story_ids = request.data.get('story_ids', [])
+        story_ids = self.get_story_ids()
 
-        try:
-            stories = StoryTemplate.objects.filter(id__in=story_ids)
-            collection.stories.remove(*stories)
-            serializer = self.get_serializer(collection)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        collection.stories.remove(*story_ids)
+        serializer = self.get_serializer(collection)
+        return Response(serializer.data)
 
 
 
@@ -177,6 +224,11 @@ class ImageAssetViewSet(viewsets.ModelViewSet):
     serializer_class = ImageAssetSerializer
     parser_classes = (MultiPartParser, FormParser)
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Stream uploads to a temporary file rather than buffering them in memory
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     def get_queryset(self):
         return ImageAsset.objects.filter(uploaded_by=self.request.user)
 
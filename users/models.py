@@ -6,6 +6,12 @@ from phonenumbers import parse as parse_phone_number
 import phonenumbers
 from rest_framework.exceptions import ValidationError
 
+# Add more country codes as needed, e.g., ('IR', 'US', 'GB')
+ALLOWED_PHONE_REGIONS = ('IR',)
+ALLOWED_COUNTRY_CODES = frozenset(
+    str(phonenumbers.country_code_for_region(region)) for region in ALLOWED_PHONE_REGIONS
+)
+
 
 class User(AbstractUser):
     email = models.EmailField(unique=True)
@@ -40,8 +46,6 @@ class User(AbstractUser):
                 parsed_number = parse_phone_number(str(self.phone_number))
 
                 # Check if it's a valid Iranian number (you can add more countries here later)
-                allowed_regions = ['IR']  # Add more country codes as needed, e.g., ['IR', 'US', 'GB']
-
                 if parsed_number.country_code == 98:  # Iran's country code
                     # Validate Iranian number format
                     if not (len(str(parsed_number.national_number)) == 10 and
@@ -50,10 +54,9 @@ class User(AbstractUser):
                             'phone_number': 'Iranian mobile numbers must start with 9 and be 10 digits long.'
                         })
                 else:
-                    if str(parsed_number.country_code) not in [str(phonenumbers.country_code_for_region(region))
-                                                               for region in allowed_regions]:
+                    if str(parsed_number.country_code) not in ALLOWED_COUNTRY_CODES:
                         raise ValidationError({
-                            'phone_number': f'Phone numbers are only accepted from these regions: {", ".join(allowed_regions)}'
+                            'phone_number': f'Phone numbers are only accepted from these regions: {", ".join(ALLOWED_PHONE_REGIONS)}'
                         })
 
                 # Ensure the number is valid for its region
@@ -67,12 +70,28 @@ class User(AbstractUser):
                     'phone_number': 'Please enter a valid phone number with country code.'
                 })
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored phone number so save() can tell if it changed
+        if 'phone_number' in instance.__dict__:
+            instance._loaded_phone_number = instance.phone_number
+        return instance
+
+    def _phone_number_changed(self):
+        if 'phone_number' not in self.__dict__:
+            # Deferred and never assigned, so it can't have changed
+            return False
+        if not hasattr(self, '_loaded_phone_number'):
+            return True
+        return self.phone_number != self._loaded_phone_number
+
     def save(self, *args, **kwargs):
-        self.full_clean()
+        if self._state.adding or self._phone_number_changed():
+            self.full_clean()
         super().save(*args, **kwargs)
-
-    def __str__(self):
-        return self.email
+        if 'phone_number' in self.__dict__:
+            self._loaded_phone_number = self.phone_number
 
     def __str__(self):
         return self.email
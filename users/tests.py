@@ -1,3 +1,133 @@
-from django.test import TestCase
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .models import User
+from .serializers import UserSerializer
+
+
+def create_user(email='reader@example.com', **kwargs):
+    return User.objects.create_user(
+        email=email,
+        username=email,
+        password='Secret-pass-123',
+        first_name='Test',
+        last_name='User',
+        age=10,
+        **kwargs
+    )
+
+
+class LoginTests(APITestCase):
+    def test_login_returns_tokens_and_user(self):
+        user = create_user(phone_number='+989121234567')
+
+        response = self.client.post(
+            reverse('login'),
+            {'email': user.email, 'password': 'Secret-pass-123'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertIn('refresh', response.data)
+        self.assertEqual(response.data['user'], UserSerializer(user).data)
+        self.assertEqual(response.data['user']['phone_number'], '+989121234567')
+
+
+@override_settings(DEFAULT_FROM_EMAIL='noreply@example.com')
+class SignUpTests(APITestCase):
+    def sign_up(self, email, **data):
+        payload = {
+            'email': email,
+            'first_name': 'New',
+            'last_name': 'Reader',
+            'password': 'Secret-pass-123',
+            'confirm_password': 'Secret-pass-123',
+            'age': 9,
+        }
+        payload.update(data)
+        return self.client.post(reverse('signup'), payload, format='json')
+
+    def test_sign_up_creates_user_and_sends_verification(self):
+        response = self.sign_up('new@example.com', phone_number='+989121234567')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(email='new@example.com')
+        self.assertTrue(user.check_password('Secret-pass-123'))
+        self.assertEqual(str(user.phone_number), '+989121234567')
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_sign_up_errors_do_not_leak_between_requests(self):
+        # Field instances are cached per serializer class; each request must
+        # still get its own validation state
+        invalid = self.sign_up('not-an-email', confirm_password='different')
+        valid = self.sign_up('second@example.com')
+
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', invalid.data)
+        self.assertEqual(valid.status_code, status.HTTP_201_CREATED)
+
+    def test_sign_up_rejects_duplicate_email(self):
+        create_user('taken@example.com')
+
+        response = self.sign_up('taken@example.com')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+
+
+class PhoneNumberValidationTests(TestCase):
+    def clean_phone(self, phone_number):
+        User(email='phone@example.com', username='phone', age=10, phone_number=phone_number).clean()
+
+    def test_valid_iranian_mobile(self):
+        self.clean_phone('+989121234567')
+
+    def test_rejects_other_regions(self):
+        with self.assertRaisesMessage(ValidationError, 'only accepted from these regions: IR'):
+            self.clean_phone('+12025550123')
+
+    def test_rejects_malformed_iranian_number(self):
+        with self.assertRaisesMessage(ValidationError, 'must start with 9 and be 10 digits long'):
+            self.clean_phone('+98912123456')
+
+
+class UserSaveValidationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.get(pk=create_user(phone_number='+989121234567').pk)
+
+    def test_save_without_phone_change_skips_validation(self):
+        self.user.first_name = 'Renamed'
+
+        # Just the UPDATE; no uniqueness lookups from full_clean()
+        with self.assertNumQueries(1):
+            self.user.save()
+
+    def test_save_with_phone_change_is_validated(self):
+        self.user.phone_number = '+12025550123'
+
+        with self.assertRaises(ValidationError):
+            self.user.save()
+
+    def test_saved_phone_becomes_the_new_baseline(self):
+        self.user.phone_number = '+989121234568'
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            self.user.save()
+
+    def test_save_with_deferred_phone_number(self):
+        user = User.objects.only('id', 'email').get(pk=self.user.pk)
+        user.first_name = 'Deferred'
+
+        user.save()
+
+        self.assertEqual(User.objects.get(pk=user.pk).first_name, 'Deferred')
+
+    def test_new_user_is_validated(self):
+        with self.assertRaises(ValidationError):
+            create_user('bad-phone@example.com', phone_number='+12025550123')